@@ -1,7 +1,10 @@
 import allure
 import logging
-from playwright.sync_api import Page, expect
-from utilities.constants import Constants as CONST
+import os
+import time
+from urllib.parse import urlsplit
+from playwright.sync_api import BrowserContext, Frame, Page, Request, expect
+from utilities.constants import BASE_URL
 
 
 from pages.airbnb.components.search_bar import SearchBar
@@ -21,12 +24,93 @@ class HomePage:
         page (Page): The Playwright page object.
         search_bar (SearchBar): The search bar component.
     """
-    
-    def __init__(self, page: Page, viewport_size=None):
+
+    # Key elements that indicate the homepage has rendered, in priority order
+    SELECTORS = [
+        "[data-testid='header-logo']",
+        "header",
+        "[data-testid='little-search']",
+        "[role='banner']",
+        "div[role='main']",
+        "body > div"  # Any div directly under body
+    ]
+
+    # Returns the first selector whose element is visible, or null if none is.
+    # Falls back to computed style on browsers without checkVisibility().
+    _FIRST_VISIBLE_JS = """sels => sels.find(s => {
+        const el = document.querySelector(s);
+        if (!el) return false;
+        if (el.checkVisibility) return el.checkVisibility();
+        return getComputedStyle(el).visibility !== 'hidden';
+    }) || null"""
+
+    # Cookie consent buttons first, then generic close buttons
+    POPUP_SELECTORS = [
+        "[data-testid='accept-btn']",
+        "[data-testid='accept-cookies']",
+        "[data-testid='cookie-policy-manage-button']",
+        "[data-testid='main-cookies-bar-agree']",
+        "button[aria-label*='Accept' i]",
+        "button[aria-label*='Cookie' i]",
+        "[data-testid='close']",
+        "[data-testid='modal-close-button']",
+        "button[aria-label='Close' i]",
+        "button.close"
+    ]
+
+    # Clicks the first visible element and returns its selector, or null if none is visible
+    _CLICK_FIRST_VISIBLE_JS = """sels => {
+        for (const s of sels) {
+            const el = document.querySelector(s);
+            if (el && el.checkVisibility && el.checkVisibility()) {
+                el.click();
+                return s;
+            }
+        }
+        return null;
+    }"""
+    _IS_HIDDEN_JS = "s => !document.querySelector(s) || !document.querySelector(s).checkVisibility()"
+
+    # Requests to these domains never settle and are irrelevant to page readiness
+    FILTERED_DOMAINS = [
+        "doubleclick",
+        "google-analytics",
+        "googletagmanager",
+        "segment.io",
+        "hotjar",
+        "sentry.io",
+        "fullstory",
+        "intercom",
+        "facebook.net",
+        "branch.io",
+        "newrelic",
+        "datadoghq",
+    ]
+    FILTERED_EXTENSIONS = [".gif", ".png", ".jpg", ".jpeg", ".webp", ".svg", ".woff", ".woff2", ".mp4", ".webm"]
+    # Requests still pending after this many milliseconds are treated as dead
+    STUCK_REQUEST_THRESHOLD = 10000
+
+    def __init__(self, page: Page, viewport_size=None, skip_popups: bool = False):
         self.page = page
+
+        # Skip popup handling when the context already carries the cookie consent
+        self.skip_popups = skip_popups
         
         # Define expected viewport size
         self.expected_viewport = viewport_size or {"width": 1920, "height": 1080}
+        # Last viewport applied/observed, so repeated checks skip the browser round-trip.
+        # The context is created with the expected viewport; main frame navigations invalidate it.
+        self._last_viewport = self.expected_viewport
+        page.on("framenavigated", self._invalidate_viewport_cache)
+
+        # In-flight requests relevant to page readiness, with their start time
+        self._pending_requests: dict[Request, float] = {}
+        page.on("request", self._track_request)
+        page.on("requestfinished", self._untrack_request)
+        page.on("requestfailed", self._untrack_request)
+
+        # Debug screenshots are only captured when AIRBNB_DEBUG=1
+        self._debug_artifacts = os.environ.get("AIRBNB_DEBUG") == "1"
         
         # Initialize the search bar component
         self.search_bar = SearchBar(page, self.expected_viewport)
@@ -34,30 +118,48 @@ class HomePage:
         # Initialize page elements with data-testid selectors
         self.logo = page.locator("[data-testid='header-logo']")
         self.profile_menu = page.locator("[data-testid='header-profile']")
-        self.language_selector = page.locator("button[aria-label*='language']").first
+        self.language_selector = page.locator(
+            "[data-testid='header-language-picker'], button[aria-label*='language' i]"
+        ).first
+        # Only visible matches count, so a hidden early match cannot mask a visible one
+        self.homepage_indicator = page.locator(
+            "[data-testid='header-logo']:visible, [data-testid='little-search']:visible, header:visible"
+        ).first
         
+    @classmethod
+    def prime_context(cls, context: BrowserContext) -> None:
+        """Install the cookie consent on a context before any page loads.
+
+        The consent banner then never renders, leaving _handle_popups as a fallback.
+
+        Args:
+            context (BrowserContext): The browser context to prime.
+        """
+        context.add_init_script(
+            "try{"
+            "localStorage.setItem('OptanonAlertBoxClosed', new Date().toISOString());"
+            "localStorage.setItem('cookie-consent','accepted')"
+            "}catch(e){}"
+        )
+        context.add_cookies([
+            {"name": "OptanonConsent", "value": "consent=true", "domain": ".airbnb.com", "path": "/"},
+            {"name": "OptanonAlertBoxClosed", "value": "true", "domain": ".airbnb.com", "path": "/"}
+        ])
+
     @allure.step("Navigate to Airbnb homepage")
     def navigate(self) -> None:
         """Navigate to the Airbnb homepage."""
         try:
-            # Enforce full screen before navigation
-            self._ensure_full_screen()
-            
             logger.info("Navigating to Airbnb homepage...")
-            # Navigate with longer timeout
-            self.page.goto(CONST.BASE_URL, timeout=60000)
+            # Navigate with longer timeout, returning as soon as the response is committed
+            self.page.goto(BASE_URL, timeout=60000, wait_until="commit")
             
             # Log the current URL
             current_url = self.page.url
             logger.info(f"Navigated to: {current_url}")
             
-            # Wait for the page to load with timeouts and error handling
-            try:
-                logger.info("Waiting for network idle...")
-                self.page.wait_for_load_state("networkidle", timeout=30000)
-            except Exception as e:
-                logger.warning(f"Network idle timeout: {e}")
-                # Try to continue anyway
+            # Enforce full screen once the navigation has committed
+            self._ensure_full_screen()
             
             try:
                 logger.info("Waiting for DOM content loaded...")
@@ -66,60 +168,97 @@ class HomePage:
                 logger.warning(f"DOM content loaded timeout: {e}")
                 # Try to continue anyway
             
+            # Wait for the page to settle, ignoring tracking beacons that never go idle
+            try:
+                logger.info("Waiting for page to settle...")
+                self._wait_for_smart_idle()
+            except Exception as e:
+                logger.warning(f"Page settle timeout: {e}")
+                # Try to continue anyway
+            
             # Wait for key elements to be visible
             logger.info("Checking for key elements on the page...")
-            selectors_to_try = [
-                self.logo,
-                self.page.locator("header"),
-                self.page.locator("[data-testid='little-search']"),
-                self.page.locator("[role='banner']"),
-                self.page.locator("div[role='main']"),
-                self.page.locator("body > div")  # Any div directly under body
-            ]
-            
-            element_found = False
-            for selector in selectors_to_try:
-                try:
-                    if selector.is_visible(timeout=5000):
-                        logger.info(f"Found visible element on page")
-                        element_found = True
-                        break
-                except Exception as e:
-                    continue
-            
-            if not element_found:
-                logger.warning("No key elements found on page, but continuing...")
-            
-            # Check viewport size again after navigation
-            self._ensure_full_screen()
-            
-            # Take a screenshot of the full viewport for debugging
             try:
-                allure.attach(
-                    self.page.screenshot(full_page=True),
-                    name="Full Page Homepage",
-                    attachment_type=allure.attachment_type.PNG
+                found = self.page.wait_for_function(
+                    self._FIRST_VISIBLE_JS, arg=self.SELECTORS, timeout=3000
                 )
-                logger.info("Screenshot taken successfully")
+                logger.info(f"Found visible element on page: {found.json_value()}")
             except Exception as e:
-                logger.warning(f"Failed to take screenshot: {e}")
+                logger.warning("No key elements found on page, but continuing...")
+            
+            # Take a screenshot of the viewport for debugging
+            if self._debug_artifacts:
+                try:
+                    allure.attach(
+                        self.page.screenshot(full_page=False, type="jpeg", quality=60),
+                        name="Homepage",
+                        attachment_type=allure.attachment_type.JPG
+                    )
+                    logger.info("Screenshot taken successfully")
+                except Exception as e:
+                    logger.warning(f"Failed to take screenshot: {e}")
 
             
         except Exception as e:
             logger.error(f"Error navigating to Airbnb homepage: {e}")
-            # Try to capture a screenshot of whatever state we're in
-            try:
-                allure.attach(
-                    self.page.screenshot(),
-                    name="Navigation Error",
-                    attachment_type=allure.attachment_type.PNG
-                )
-            except Exception as screenshot_error:
-                logger.error(f"Could not take screenshot after navigation error: {screenshot_error}")
+            # Try to capture a screenshot of whatever state we're in, bounded in case the renderer hangs
+            if not self.page.is_closed():
+                try:
+                    allure.attach(
+                        self.page.screenshot(timeout=3000, full_page=False),
+                        name="Navigation Error",
+                        attachment_type=allure.attachment_type.PNG
+                    )
+                except Exception as screenshot_error:
+                    logger.error(f"Could not take screenshot after navigation error: {screenshot_error}")
             
             # Re-raise the error
             raise
 
+    def _track_request(self, request: Request) -> None:
+        """Record a request as in flight unless it is irrelevant to page readiness."""
+        url = request.url
+        if any(domain in url for domain in self.FILTERED_DOMAINS):
+            return
+        if url.split("?")[0].endswith(tuple(self.FILTERED_EXTENSIONS)):
+            return
+        self._pending_requests[request] = time.monotonic()
+
+    def _untrack_request(self, request: Request) -> None:
+        """Forget a request once it has finished or failed."""
+        self._pending_requests.pop(request, None)
+
+    def _wait_for_smart_idle(self, timeout: int = 15000) -> None:
+        """Wait until the document is complete and no relevant requests are pending.
+
+        Requests to analytics/tracking domains, media assets and requests
+        pending longer than the stuck threshold are ignored, since Airbnb keeps
+        some of them open indefinitely and they never let "networkidle" fire.
+
+        Args:
+            timeout (int, optional): Timeout in milliseconds. Defaults to 15000.
+
+        Raises:
+            TimeoutError: If the page has not settled within the timeout.
+        """
+        deadline = time.monotonic() + timeout / 1000
+        while True:
+            ready_state = self.page.evaluate("document.readyState")
+            # Requests are tracked from the request/requestfinished/requestfailed events
+            now = time.monotonic()
+            pending = [
+                request.url for request, started in self._pending_requests.items()
+                if (now - started) * 1000 < self.STUCK_REQUEST_THRESHOLD
+            ]
+            if ready_state == "complete" and not pending:
+                return
+            if now >= deadline:
+                raise TimeoutError(
+                    f"Page did not settle within {timeout}ms, "
+                    f"readyState: {ready_state}, pending: {pending}"
+                )
+            self.page.wait_for_timeout(100)
+
     def _verify_on_homepage(self) -> bool:
         """Verify that we are on the Airbnb homepage.
 
@@ -127,23 +266,16 @@ class HomePage:
             bool: True if we are on the homepage, False otherwise.
         """
         try:
-            # Check URL
-            current_url = self.page.url.lower()
-            if "airbnb.com" not in current_url:
-                logger.warning(f"URL doesn't contain airbnb.com: {current_url}")
+            # Check URL host
+            host = (urlsplit(self.page.url).hostname or "").lower()
+            if host != "airbnb.com" and not host.endswith(".airbnb.com"):
+                logger.warning(f"URL host is not airbnb.com: {host}")
                 return False
 
-            # Check for expected elements
-            homepage_indicators = [
-                (self.logo, "logo"),
-                (self.page.locator("[data-testid='little-search']"), "search box"),
-                (self.page.locator("header"), "header")
-            ]
-
-            for indicator, name in homepage_indicators:
-                if indicator.is_visible(timeout=1000):
-                    logger.info(f"Found homepage indicator: {name}")
-                    return True
+            # Check for any of the expected elements (logo, search box, header) at once
+            if self.homepage_indicator.is_visible(timeout=1500):
+                logger.info("Found homepage indicator")
+                return True
 
             logger.warning("No homepage indicators found")
             return False
@@ -155,72 +287,20 @@ class HomePage:
     @allure.step("Handle popups")
     def _handle_popups(self) -> None:
         """Handle any popups that might appear on the page."""
-        # Try various cookie consent selectors
-        cookie_test_ids = [
-            "accept-btn",
-            "accept-cookies",
-            "cookie-policy-manage-button",
-            "main-cookies-bar-agree"
-        ]
-
-        # First try with locator using data-testid
-        for test_id in cookie_test_ids:
-            try:
-                cookie_button = self.page.locator(f"[data-testid='{test_id}']")
-                if cookie_button.is_visible(timeout=1000):
-                    cookie_button.click()
-                    self.page.wait_for_timeout(1000)  # Wait for popup to disappear
-                    break
-            except:
-                continue
-
-        # Try with attribute selectors if test_ids don't work
-        cookie_selectors = [
-            "button[aria-label*='Accept']",
-            "button[aria-label*='accept']",
-            "button[aria-label*='Cookie']"
-        ]
-
-        for selector in cookie_selectors:
-            try:
-                cookie_button = self.page.locator(selector).first
-                if cookie_button.is_visible(timeout=1000):
-                    cookie_button.click()
-                    self.page.wait_for_timeout(1000)  # Wait for popup to disappear
-                    break
-            except:
-                continue
-
-        # Handle any other popups that might appear
-        close_test_ids = ["close", "modal-close-button"]
-
-        # First try with locator for data-testid
-        for test_id in close_test_ids:
-            try:
-                close_button = self.page.locator(f"[data-testid='{test_id}']")
-                if close_button.is_visible(timeout=1000):
-                    close_button.click()
-                    self.page.wait_for_timeout(1000)  # Wait for popup to disappear
-                    break
-            except:
-                continue
-
-        # Try with attribute selectors
-        close_selectors = [
-            "button[aria-label='Close']",
-            "button[aria-label='close']",
-            "button.close"
-        ]
-
-        for selector in close_selectors:
-            try:
-                close_button = self.page.locator(selector).first
-                if close_button.is_visible(timeout=1000):
-                    close_button.click()
-                    self.page.wait_for_timeout(1000)  # Wait for popup to disappear
-                    break
-            except:
-                continue
+        if self.skip_popups:
+            return
+
+        # Click the first visible cookie consent or close button in a single pass
+        clicked = self.page.evaluate(self._CLICK_FIRST_VISIBLE_JS, self.POPUP_SELECTORS)
+        if not clicked:
+            return
+
+        logger.info(f"Dismissed popup using: {clicked}")
+        try:
+            # Wait for popup to disappear
+            self.page.wait_for_function(self._IS_HIDDEN_JS, arg=clicked, timeout=3000)
+        except Exception as e:
+            logger.warning(f"Popup still visible after clicking {clicked}: {e}")
 
     @allure.step("Click on profile menu")
     def click_profile_menu(self) -> None:
@@ -237,8 +317,16 @@ class HomePage:
         """Click on the Airbnb logo."""
         self.logo.click()
         
+    def _invalidate_viewport_cache(self, frame: Frame) -> None:
+        """Force the next viewport check to query the browser after a main frame navigation."""
+        if frame == self.page.main_frame:
+            self._last_viewport = None
+
     def _ensure_full_screen(self) -> None:
         """Ensure the browser is in full screen mode (1920x1080)."""
+        if self._last_viewport is not None:
+            return
+
         current_viewport = self.page.viewport_size
 
         if current_viewport != self.expected_viewport:
@@ -253,10 +341,13 @@ class HomePage:
             # Force browser to full screen
             self.page.set_viewport_size(self.expected_viewport)
             
-            # Bring the window to front to ensure it keeps focus
-            self.page.context.pages[0].bring_to_front()
-            
             # Wait for the viewport size to take effect
-            self.page.wait_for_timeout(500)
+            self.page.wait_for_function(
+                "vp => window.innerWidth === vp.width && window.innerHeight === vp.height",
+                arg=self.expected_viewport,
+                timeout=2000
+            )
+            self._last_viewport = self.expected_viewport
         else:
-            logger.info(f"[HomePage] Viewport check OK: {current_viewport}") 
\ No newline at end of file
+            self._last_viewport = current_viewport
+            logger.debug("[HomePage] Viewport check OK: %s", current_viewport) 
\ No newline at end of file
@@ -1,16 +1,38 @@
 import allure
+import json
 import logging
-from datetime import datetime, timedelta
-from playwright.sync_api import Page, expect, TimeoutError
+import os
+import re
+import time
+from datetime import date, datetime
+from functools import reduce
+from typing import Optional, Union
+from playwright.sync_api import Frame, Locator, Page, Request, Response, Route, expect, TimeoutError
 
 from pages.airbnb.components.search_results import SearchResults
 from pages.airbnb.components.search_bar import SearchBar
-from utilities.constants import Constants as CONST
+from utilities.constants import ADULTS_COUNT
 
 
 # Configure logging
 logger = logging.getLogger("AirbnbSearchResultsPage")
 
+# Leading count in texts like "3 guests", "1 guest", "2 children" or "1 child"
+_COUNT_RE = re.compile(r"(\d+)")
+
+
+def _parse_count(text: str) -> int:
+    """Parse the leading count from a guests/children label.
+
+    Raises:
+        ValueError: If the label contains no count.
+    """
+    match = _COUNT_RE.search(text)
+    if match is None:
+        raise ValueError(f"No count found in label: {text!r}")
+    return int(match.group(1))
+
+
 @allure.severity(allure.severity_level.NORMAL)
 @allure.story("Airbnb search results behavior")
 class SearchResultsPage:
@@ -18,16 +40,92 @@ class SearchResultsPage:
     
     This page object represents the search results page on Airbnb.
     
+    Once the results page is loading, heavy assets (images, fonts, media) are
+    blocked by default; pass block_assets=False for tests that need the page
+    fully rendered. Stylesheets are never blocked, so visibility checks and
+    screenshots still see the styled layout.
+    
     Attributes:
         page (Page): The Playwright page object.
         search_results (SearchResults): The search results component.
     """
     
-    def __init__(self, page: Page, viewport_size=None):
+    # Resource types that are not needed to verify search results
+    BLOCKED_RESOURCE_TYPES = frozenset({
+        "image", "font", "media", "beacon", "csp_report", "imageset"
+    })
+
+    # Elements that indicate the results page has loaded, most specific first
+    LOAD_INDICATORS = [
+        "card-container",
+        "listing-card",
+        "explore-footer",
+        "little-search"  # This might be visible even on search results page
+    ]
+    GENERIC_LOAD_SELECTORS = [
+        "[itemprop='itemListElement']",
+        "main[id='site-content']",
+        "div[role='main']",
+        "footer",
+        "h1",  # Often there's at least an h1 on the page
+        "div.container"  # Common container class
+    ]
+    # Every alternative only matches visible elements, so a hidden early match cannot mask later ones
+    LOAD_INDICATOR_SELECTOR = ",".join(
+        f"{selector}:visible"
+        for selector in [f"[data-testid='{test_id}']" for test_id in LOAD_INDICATORS] + GENERIC_LOAD_SELECTORS
+    )
+
+    # For the given range, returns the first blocked day, whether any day is not rendered,
+    # and whether the start/end days can be clicked
+    _CALENDAR_RANGE_STATE_JS = """([startStr, endStr, dateStrs]) => {
+        const day = s => document.querySelector(`[data-testid="calendar-day-${s}"]`);
+        let firstBlocked = null;
+        let missing = false;
+        for (const s of dateStrs) {
+            const el = day(s);
+            if (!el) {
+                missing = true;
+            } else if (el.getAttribute('data-is-day-blocked') === 'true') {
+                firstBlocked = s;
+                break;
+            }
+        }
+        return {firstBlocked, missing, startOk: !!day(startStr), endOk: !!day(endStr)};
+    }"""
+
+    # Screenshots taken within this many milliseconds of each other are reused
+    SCREENSHOT_REUSE_MS = 500
+
+    def __init__(self, page: Page, viewport_size=None, block_assets: bool = True):
         self.page = page
+        self._loc_cache: dict[tuple[Page, str], Locator] = {}
+
+        # Capture the search API response so results can be verified without DOM scraping
+        self._last_search_json = None
+        page.on("request", self._reset_search_response)
+        page.on("response", self._capture_search_response)
+
+        # Heavy asset requests are aborted once the results page loads, unless a test
+        # needs the page fully rendered; the homepage flow is never affected
+        self._block_assets = block_assets
+        self._assets_route_installed = False
         
         # Define expected viewport size
         self.expected_viewport = viewport_size or {"width": 1920, "height": 1080}
+        # Last viewport applied/observed, so repeated checks skip the browser round-trip;
+        # main frame navigations invalidate it
+        self._last_viewport = None
+        page.on("framenavigated", self._invalidate_viewport_cache)
+
+        # Debug screenshots are only captured when AIRBNB_DEBUG=1
+        self._debug_artifacts = os.environ.get("AIRBNB_DEBUG") == "1"
+
+        # Last screenshot capture, reused by _attach_screenshot for back-to-back attachments
+        self._last_screenshot_key = None
+        self._last_screenshot_ts = 0
+        self._last_screenshot_bytes = None
+        self._attached_screenshots = set()
 
         # Initialize the search results component
         self.search_results = SearchResults(page)
@@ -37,6 +135,8 @@ class SearchResultsPage:
         self.filter_button = page.locator("[data-testid='category-bar-filter-button']")
         self.map_toggle = page.locator("[data-testid='map-toggle']")
         self.search_box = page.locator("[data-testid='little-search']")
+        # Add .first to handle multiple matches - fixes strict mode violation
+        self.load_indicator = page.locator(self.LOAD_INDICATOR_SELECTOR).first
 
         #listing details
         self.checkin_date = page.locator("[data-testid='change-dates-checkIn']")
@@ -44,25 +144,37 @@ class SearchResultsPage:
         self.guests_count = page.locator("[id='GuestPicker-book_it-trigger']")
 
     @allure.step("Wait for page to load")
-    def wait_for_page_load(self, timeout: int = 60000) -> None:
+    def wait_for_page_load(self, timeout: int = 60000, page_load_timeout: Optional[int] = None) -> None:
         """Wait for the search results page to load.
         
+        All sub-waits are derived from the overall timeout, so a small timeout
+        bounds the whole wait.
+        
         Args:
             timeout (int, optional): Timeout in milliseconds. Defaults to 60000.
+            page_load_timeout (int, optional): Timeout in milliseconds for the document
+                ready state to become complete. Defaults to a quarter of the timeout.
         """
+        if page_load_timeout is None:
+            page_load_timeout = timeout // 4
+        indicator_timeout = timeout // 6
+        probe_timeout = max(500, timeout // 20)
+
         try:
+            # Block heavy assets from here on, now that we are on the results page
+            if self._block_assets and not self._assets_route_installed:
+                self.page.route("**/*", self._block_heavy)
+                self._assets_route_installed = True
+
             # Ensure we're in fullscreen mode
             self._ensure_full_screen()
             
             # Take a full-page screenshot before we wait
-            try:
-                allure.attach(
-                    self.page.screenshot(full_page=True),
-                    name="Before Results Page Load - Full Page",
-                    attachment_type=allure.attachment_type.PNG
-                )
-            except Exception as screenshot_error:
-                logger.warning(f"Failed to take initial screenshot: {screenshot_error}")
+            if self._debug_artifacts:
+                try:
+                    self._attach_screenshot("Before Results Page Load - Full Page", full_page=True)
+                except Exception as screenshot_error:
+                    logger.warning(f"Failed to take initial screenshot: {screenshot_error}")
             
             # Check if the page is still available
             if not self._is_page_available():
@@ -72,7 +184,7 @@ class SearchResultsPage:
             # First try to wait for network requests to settle, but don't fail if it times out
             try:
                 logger.info("Waiting for DOM content loaded...")
-                self.page.wait_for_load_state("domcontentloaded", timeout=min(15000, timeout // 4))
+                self.page.wait_for_load_state("domcontentloaded", timeout=timeout // 4)
                 logger.info("DOM content loaded reached")
             except Exception as dom_error:
                 logger.warning(f"DOM content loaded timed out: {dom_error}")
@@ -83,102 +195,63 @@ class SearchResultsPage:
                     attachment_type=allure.attachment_type.TEXT
                 )
 
-            # Wait a small amount of time for any JavaScript to run
-            logger.info("Waiting for JS execution...")
-            self.page.wait_for_timeout(3000)
+            # Poll for the document to finish loading instead of sleeping for a fixed time
+            try:
+                logger.info("Waiting for document ready state...")
+                self.page.wait_for_function(
+                    "document.readyState === 'complete'", timeout=page_load_timeout, polling=100
+                )
+                page_ready = True
+            except Exception as ready_error:
+                logger.warning(f"Document ready state timed out: {ready_error}")
+                page_ready = False
             
             # Check if the page is still available
             if not self._is_page_available():
                 logger.error("Page is no longer available after load states")
                 return
             
-            # Check viewport size again and fix if needed
-            self._ensure_full_screen()
-            
             # Take a full-page screenshot after waiting
+            if self._debug_artifacts:
+                try:
+                    self._attach_screenshot("After Results Page Load - Full Page", full_page=True)
+                except Exception as screenshot_error:
+                    logger.warning(f"Failed to take post-load screenshot: {screenshot_error}")
+            
+            if page_ready:
+                logger.info("Document ready state reached")
+                return
+            
+            # Fall back to probing for known elements if the ready state never completed
+            if not self._is_page_available():
+                logger.error("Page is no longer available while checking load indicators")
+                return
+
+            # Wait for any of the load indicators in a single query
             try:
+                self.load_indicator.wait_for(state="visible", timeout=indicator_timeout)
                 allure.attach(
-                    self.page.screenshot(full_page=True),
-                    name="After Results Page Load - Full Page",
-                    attachment_type=allure.attachment_type.PNG
+                    f"Found load indicator matching: {self.LOAD_INDICATOR_SELECTOR}",
+                    name="Page Load Success",
+                    attachment_type=allure.attachment_type.TEXT
                 )
-            except Exception as screenshot_error:
-                logger.warning(f"Failed to take post-load screenshot: {screenshot_error}")
-            
-            # Try different selectors to determine if the page has loaded
-            load_indicators = [
-                "card-container",
-                "listing-card",
-                "explore-footer",
-                "little-search"  # This might be visible even on search results page
-            ]
-            
-            # First try with direct selectors using locator with data-testid
-            for test_id in load_indicators:
-                if not self._is_page_available():
-                    logger.error("Page is no longer available while checking load indicators")
-                    return
-                    
-                try:
-                    # Add .first to handle multiple matches - fixes strict mode violation
-                    element = self.page.locator(f"[data-testid='{test_id}']").first
-                    if element.is_visible(timeout=2000):
-                        allure.attach(
-                            f"Found load indicator with test_id: {test_id}",
-                            name="Page Load Success",
-                            attachment_type=allure.attachment_type.TEXT
-                        )
-                        logger.info(f"Found load indicator: {test_id}")
-                        return
-                except Exception as e:
-                    logger.info(f"Indicator {test_id} not found: {e}")
-                    continue
-                    
-            # If none of the test_ids worked, try with more generic selectors
-            generic_selectors = [
-                "[itemprop='itemListElement']",
-                "main[id='site-content']",
-                "div[role='main']",
-                "footer",
-                "h1",  # Often there's at least an h1 on the page
-                "div.container"  # Common container class
-            ]
-            
-            for selector in generic_selectors:
-                if not self._is_page_available():
-                    logger.error("Page is no longer available while checking generic selectors")
-                    return
-                    
-                try:
-                    element = self.page.locator(selector).first
-                    if element.is_visible(timeout=2000):
-                        allure.attach(
-                            f"Found load indicator with selector: {selector}",
-                            name="Page Load Success",
-                            attachment_type=allure.attachment_type.TEXT
-                        )
-                        logger.info(f"Found load indicator: {selector}")
-                        return
-                except Exception as e:
-                    logger.info(f"Selector {selector} not found: {e}")
-                    continue
+                logger.info("Found load indicator")
+                return
+            except Exception as e:
+                logger.info(f"Load indicators not found: {e}")
                     
             # Wait for any visible element on the page as a last resort
             if self._is_page_available():
                 try:
                     logger.info("Waiting for any visible element...")
-                    self.page.wait_for_selector("body > *", timeout=5000)
+                    self.page.wait_for_selector("body > *", timeout=probe_timeout)
                     logger.info("Found at least some content on the page")
                 except Exception as e:
                     logger.warning(f"No content found on page: {e}")
             
             # If we get here, none of the selectors were found within timeout
             try:
-                allure.attach(
-                    self.page.screenshot(),
-                    name="Page loaded without specific indicators",
-                    attachment_type=allure.attachment_type.PNG
-                )
+                self._attach_screenshot("Page loaded without specific indicators")
             except Exception as screenshot_error:
                 logger.warning(f"Failed to take final screenshot: {screenshot_error}")
                 
@@ -196,6 +269,129 @@ class SearchResultsPage:
             except:
                 pass
                 
+    def _attach_screenshot(self, name: str, page: Page = None, full_page: bool = False) -> None:
+        """Attach a screenshot to the Allure report without capturing twice.
+
+        A capture of the same page taken within SCREENSHOT_REUSE_MS is reused, and
+        each name is attached only once so screenshots don't pile up across steps.
+
+        Args:
+            name (str): The attachment name.
+            page (Page, optional): The page to capture. Defaults to the search results page.
+            full_page (bool, optional): Whether to capture the full scrollable page. Defaults to False.
+        """
+        if name in self._attached_screenshots:
+            return
+
+        key = (page or self.page, full_page)
+        now = time.monotonic()
+        if self._last_screenshot_key != key or (now - self._last_screenshot_ts) * 1000 >= self.SCREENSHOT_REUSE_MS:
+            self._last_screenshot_bytes = key[0].screenshot(full_page=full_page)
+            self._last_screenshot_key = key
+            self._last_screenshot_ts = now
+
+        allure.attach(
+            self._last_screenshot_bytes,
+            name=name,
+            attachment_type=allure.attachment_type.PNG
+        )
+        self._attached_screenshots.add(name)
+
+    def _inner_texts(self, page: Page, *selectors: str) -> list:
+        """Read the inner text of the first element of each selector in a single call.
+
+        Args:
+            page (Page): The page to read from.
+            *selectors (str): The selectors to read.
+
+        Returns:
+            list: The inner texts, in the order of the selectors.
+
+        Raises:
+            AssertionError: If a selector matches nothing.
+        """
+        texts = page.evaluate(
+            "sels => sels.map(s => document.querySelector(s)?.innerText ?? null)", list(selectors)
+        )
+        for selector, text in zip(selectors, texts):
+            assert text is not None, f"No element found for selector: {selector}"
+        return texts
+
+    def _any_of(self, *selectors: str) -> Locator:
+        """Combine the cached locators for the selectors into one that matches any visible one.
+
+        Each alternative only matches visible elements, so .first picks a visible
+        element rather than whichever match comes first in the DOM.
+
+        Args:
+            *selectors (str): The selectors to combine.
+
+        Returns:
+            Locator: A locator matching visible elements of any of the selectors.
+        """
+        return reduce(Locator.or_, (self._loc(f"{selector}:visible") for selector in selectors))
+
+    def _reset_search_response(self, request: Request) -> None:
+        """Forget the captured StaysSearch response when a new search starts.
+
+        Args:
+            request (Request): The network request.
+        """
+        if "StaysSearch" in request.url:
+            self._last_search_json = None
+
+    def _capture_search_response(self, response: Response) -> None:
+        """Keep the JSON body of the latest StaysSearch API response.
+
+        Args:
+            response (Response): The network response.
+        """
+        if "StaysSearch" not in response.url:
+            return
+        try:
+            self._last_search_json = response.json()
+        except Exception as e:
+            logger.info(f"Could not read StaysSearch response: {e}")
+
+    def _get_stays_search_results(self) -> Optional[Union[dict, list]]:
+        """Get the search results section of the captured StaysSearch response.
+
+        Returns:
+            Optional[Union[dict, list]]: The search results, or None if no usable
+                response was captured.
+        """
+        try:
+            return self._last_search_json["data"]["presentation"]["staysSearch"]["searchResults"]
+        except (KeyError, TypeError):
+            return None
+
+    def _loc(self, selector: str, page: Page = None) -> Locator:
+        """Return a cached locator for the selector on the given page.
+
+        Args:
+            selector (str): The selector to locate.
+            page (Page, optional): The page to locate on, e.g. the listing popup.
+                Defaults to the search results page.
+
+        Returns:
+            Locator: The cached locator.
+        """
+        key = (page or self.page, selector)
+        if key not in self._loc_cache:
+            self._loc_cache[key] = key[0].locator(selector)
+        return self._loc_cache[key]
+
+    def _block_heavy(self, route: Route) -> None:
+        """Abort requests for heavy assets and let everything else through.
+
+        Args:
+            route (Route): The intercepted route.
+        """
+        if route.request.resource_type in self.BLOCKED_RESOURCE_TYPES:
+            route.abort()
+        else:
+            route.continue_()
+
     def _is_page_available(self) -> bool:
         """Check if the page is still available and not closed.
         
@@ -209,8 +405,16 @@ class SearchResultsPage:
         except Exception:
             return False
     
+    def _invalidate_viewport_cache(self, frame: Frame) -> None:
+        """Force the next viewport check to query the browser after a main frame navigation."""
+        if frame == self.page.main_frame:
+            self._last_viewport = None
+
     def _ensure_full_screen(self) -> None:
         """Ensure the browser is in full screen mode (1920x1080)."""
+        if self._last_viewport == self.expected_viewport:
+            return
+
         current_viewport = self.page.viewport_size
 
         if current_viewport != self.expected_viewport:
@@ -225,13 +429,15 @@ class SearchResultsPage:
             # Force browser to full screen
             self.page.set_viewport_size(self.expected_viewport)
             
-            # Bring the window to front to ensure it keeps focus
-            self.page.context.pages[0].bring_to_front()
-            
             # Wait for the viewport size to take effect
-            self.page.wait_for_timeout(500)
+            self.page.wait_for_function(
+                "vp => window.innerWidth === vp.width && window.innerHeight === vp.height",
+                arg=self.expected_viewport,
+                timeout=2000
+            )
         else:
             logger.info(f"[SearchResultsPage] Viewport check OK: {current_viewport}")
+        self._last_viewport = self.expected_viewport
 
 
     @allure.step("Verify search results for {destination}")
@@ -244,84 +450,50 @@ class SearchResultsPage:
         Returns:
             bool: True if the search results are for the specified destination.
         """
-        # First check the page URL or title
-        current_url = self.page.url.lower()
-        page_title = self.page.title().lower()
         destination_lower = destination.lower()
 
+        # The URL is known without a browser round-trip, so check it first
+        if destination_lower in self.page.url.lower():
+            return True
+
+        # The intercepted search API response answers this without touching the DOM
+        stays_search = self._get_stays_search_results()
+        if isinstance(stays_search, dict):
+            logging_metadata = json.dumps(stays_search.get("loggingMetadata", {})).lower()
+            if destination_lower in logging_metadata:
+                return True
+
+        # Then check the page title
+        page_title = self.page.title().lower()
+
         # Take a screenshot for debugging
         self.page.screenshot(path="test-results/verify-search-results.png")
 
-        url_contains_destination = destination_lower in current_url
         title_contains_destination = destination_lower in page_title
 
-        # Try to find destination in page content
+        # Try to find destination in a heading, breadcrumb or search filter, all at once
+        content = self._any_of(
+            "[data-testid='explore-header']",
+            "h1",
+            "[data-section-id='TITLE_DEFAULT']",
+            "[data-plugin-in-point-id='EXPLORE_HEADER']",
+            "[data-testid='little-search']",
+            "[data-testid='structured-search-input-field-query']",
+            "button[data-index='0']"
+        )
         try:
-            # Look for the destination in various elements
-            destination_in_content = False
-
-            # Check if destination appears in heading or breadcrumbs
-            test_ids = ["explore-header"]
-            for test_id in test_ids:
-                try:
-                    heading = self.page.locator(f"[data-testid='{test_id}']")
-                    if heading.is_visible(timeout=1000):
-                        heading_text = heading.inner_text().lower()
-                        if destination_lower in heading_text:
-                            destination_in_content = True
-                            break
-                except:
-                    continue
-
-            # Try other generic selectors if test_ids didn't work
-            heading_selectors = [
-                "h1",
-                "[data-section-id='TITLE_DEFAULT']",
-                "[data-plugin-in-point-id='EXPLORE_HEADER']"
-            ]
-
-            for selector in heading_selectors:
-                heading = self.page.locator(selector).first
-                if heading.is_visible(timeout=1000):
-                    heading_text = heading.inner_text().lower()
-                    if destination_lower in heading_text:
-                        destination_in_content = True
-                        break
-
-            # Check filters or search params
-            filter_test_ids = ["little-search", "structured-search-input-field-query"]
-            for test_id in filter_test_ids:
-                try:
-                    filter_elem = self.page.locator(f"[data-testid='{test_id}']")
-                    if filter_elem.is_visible(timeout=1000):
-                        filter_text = filter_elem.inner_text().lower()
-                        if destination_lower in filter_text:
-                            destination_in_content = True
-                            break
-                except:
-                    continue
-
-            # Try other selectors if test_ids didn't work
-            if not destination_in_content:
-                filter_selectors = ["button[data-index='0']"]
-
-                for selector in filter_selectors:
-                    filter_elem = self.page.locator(selector).first
-                    if filter_elem.is_visible(timeout=1000):
-                        filter_text = filter_elem.inner_text().lower()
-                        if destination_lower in filter_text:
-                            destination_in_content = True
-                            break
-        except Exception as e:
+            expect(content.filter(has_text=destination).first).to_be_visible(timeout=5000)
+            destination_in_content = True
+        except (AssertionError, TimeoutError) as e:
             destination_in_content = False
             allure.attach(
                 str(e),
-                name="Error checking destination in content",
+                name="Destination not found in content",
                 attachment_type=allure.attachment_type.TEXT
             )
 
         # Return True if the destination is found in any of the checked places
-        return url_contains_destination or title_contains_destination or destination_in_content
+        return title_contains_destination or destination_in_content
 
     @allure.step("Get number of search results")
     def get_results_count(self) -> int:
@@ -339,90 +511,64 @@ class SearchResultsPage:
         Returns:
             bool: True if the search was successful.
         """
+        # The URL is known without a browser round-trip, so check it first
+        current_url = self.page.url.lower()
+        if "/s/" in current_url or "search_type" in current_url:
+            return True
+
+        # The intercepted search API response already lists the results;
+        # fall back to the DOM unless it holds a list of listings
+        stays_search = self._get_stays_search_results()
+        listings = stays_search.get("searchResults") if isinstance(stays_search, dict) else stays_search
+        if isinstance(listings, list):
+            return len(listings) > 0
+
         # Take a screenshot for debugging
         self.page.screenshot(path="test-results/check-search-success.png")
         
         # Check if the page has loaded properly
         try:
-            # Check for search results containers with test_ids
-            result_test_ids = ["card-container", "listing-card", "explore-footer"]
-            
-            for test_id in result_test_ids:
-                try:
-                    container = self.page.locator(f"[data-testid='{test_id}']")
-                    # Use .first to handle multiple elements
-                    if container.first.is_visible(timeout=2000):
-                        return True
-                except:
-                    continue
-            
-            # Try generic selectors if test_ids didn't work
-            result_selectors = [
-                "[itemprop='itemListElement']", 
+            # Check for any of the search results containers at once
+            containers = self._any_of(
+                "[data-testid='card-container']",
+                "[data-testid='listing-card']",
+                "[data-testid='explore-footer']",
+                "[itemprop='itemListElement']",
                 "div[role='main']",
                 "main[id='site-content']"
-            ]
-            
-            for selector in result_selectors:
-                container = self.page.locator(selector).first
-                if container.is_visible(timeout=2000):
-                    return True
-            
-            # Check for empty state with test_ids
+            )
             try:
-                empty_test_id = "no-results-section"
-                empty_state = self.page.locator(f"[data-testid='{empty_test_id}']")
-                if empty_state.is_visible(timeout=1000):
-                    # Search was technically successful, but no results were found
-                    return False
-            except:
+                # Use .first to handle multiple elements
+                expect(containers.first).to_be_visible(timeout=5000)
+                return True
+            except (AssertionError, TimeoutError):
                 pass
-                
-            # Try generic empty state selectors
-            empty_selectors = [
+            
+            # Check for any empty state at once
+            empty_state = self._any_of(
+                "[data-testid='no-results-section']",
                 "div:has-text('No results found')",
                 "div:has-text('We couldn\\'t find any')"
-            ]
-            
-            for selector in empty_selectors:
-                empty_state = self.page.locator(selector).first
-                if empty_state.is_visible(timeout=1000):
-                    # Search was technically successful, but no results were found
-                    return False
+            )
+            if empty_state.first.is_visible():
+                # Search was technically successful, but no results were found
+                return False
                 
-            # Check if we're still on the homepage using test_ids
-            homepage_test_ids = ["home-search-form", "home-banner"]
-            for test_id in homepage_test_ids:
-                try:
-                    indicator = self.page.locator(f"[data-testid='{test_id}']")
-                    if indicator.is_visible(timeout=1000):
-                        # We're still on the homepage, so search did not complete
-                        return False
-                except:
-                    continue
-                    
-            # Try generic homepage indicators
-            homepage_selectors = ["header:has-text('Airbnb it')"]
-            for selector in homepage_selectors:
-                indicator = self.page.locator(selector).first
-                if indicator.is_visible(timeout=1000):
-                    # We're still on the homepage, so search did not complete
-                    return False
+            # Check if we're still on the homepage
+            homepage_indicator = self._any_of(
+                "[data-testid='home-search-form']",
+                "[data-testid='home-banner']",
+                "header:has-text('Airbnb it')"
+            )
+            if homepage_indicator.first.is_visible():
+                # We're still on the homepage, so search did not complete
+                return False
                     
-            # Check the URL to see if it looks like a search results page
-            current_url = self.page.url.lower()
-            if "/s/" in current_url or "search_type" in current_url:
-                return True
-                
             # If we can see listings, it's successful
             return self.get_results_count() > 0
             
         except Exception as e:
-            allure.attach(
-                self.page.screenshot(),
-                name="Search success check error",
-                attachment_type=allure.attachment_type.PNG
-            )
+            self._attach_screenshot("Search success check error")
             allure.attach(str(e), name="Error details", attachment_type=allure.attachment_type.TEXT)
             return False
 
@@ -438,48 +584,41 @@ class SearchResultsPage:
         logger.info("New page opened")
 
         # Wait for the new page to load
-        new_page.wait_for_load_state("networkidle", timeout=30000)
+        new_page.wait_for_load_state("domcontentloaded", timeout=15000)
         logger.info("New page loaded")
 
         # Screenshot the new page
-        allure.attach(
-            new_page.screenshot(),
-            name="New listing page",
-            attachment_type=allure.attachment_type.PNG
-        )
+        self._attach_screenshot("New listing page", new_page)
 
         # Get the check-in date text
-        check_in_element = new_page.locator('[data-testid="change-dates-checkIn"]')
-        check_out_element = new_page.locator('[data-testid="change-dates-checkOut"]')
-        guests_number_element = new_page.locator('[id="GuestPicker-book_it-trigger"]')
-
-        # Wait for the element to be visible and get its text
-        if check_in_element.is_visible(timeout=5000):
-            check_in_text = check_in_element.inner_text()
-            check_out_text = check_out_element.inner_text()
-            guests_number_text = guests_number_element.inner_text()
-            logger.info(f"Check-in date found: {check_in_text}")
-            logger.info(f"Check-out date found: {check_out_text}")
-            logger.info(f"Guests number found: {guests_number_text}")
-            check_in_text = self.search_results.convert_date_format(check_in_text)
-            check_out_text = self.search_results.convert_date_format(check_out_text)
-            guests_number_text = int(guests_number_text.split("guests")[0])
+        check_in_element = self._loc('[data-testid="change-dates-checkIn"]', new_page)
+
+        # Wait for the element to be visible and get the dates and guests texts in one call
+        check_in_element.wait_for(state="visible", timeout=10000)
+        check_in_text, check_out_text, guests_number_text = self._inner_texts(
+            new_page,
+            '[data-testid="change-dates-checkIn"]',
+            '[data-testid="change-dates-checkOut"]',
+            '[id="GuestPicker-book_it-trigger"]'
+        )
+        logger.info(f"Check-in date found: {check_in_text}")
+        logger.info(f"Check-out date found: {check_out_text}")
+        logger.info(f"Guests number found: {guests_number_text}")
+        check_in_text = self.search_results.convert_date_format(check_in_text)
+        check_out_text = self.search_results.convert_date_format(check_out_text)
+        guests_number_text = _parse_count(guests_number_text)
 
-            try:
-                logger.info("asserting check-in date")
-                assert check_in_text == check_in_formatted
-                logger.info("asserting check-out date")
-                assert check_out_text == check_out_formatted
-                logger.info("asserting guests number")
-                assert guests_number_text == adults_count + child_count
-            except AssertionError as e:
-                logger.error(f"highest listing card details validation failed: {e}")
-                allure.attach(
-                    self.page.screenshot(),
-                    name="highest listing card details validation error",
-                    attachment_type=allure.attachment_type.PNG
-                )
-                raise e
+        try:
+            logger.info("asserting check-in date")
+            assert check_in_text == check_in_formatted
+            logger.info("asserting check-out date")
+            assert check_out_text == check_out_formatted
+            logger.info("asserting guests number")
+            assert guests_number_text == adults_count + child_count
+        except AssertionError as e:
+            logger.error(f"highest listing card details validation failed: {e}")
+            self._attach_screenshot("highest listing card details validation error")
+            raise e
 
     @allure.step("Removing kids from the highest rate listing")
     def remove_kids_from__highest_rated_listing(self, popup_card_details_page, new_child_count):
@@ -488,17 +627,17 @@ class SearchResultsPage:
 
         #get the current child number
 
-        guests_button = new_page.locator('[id="GuestPicker-book_it-trigger"]')
-        current_guest_number = int(guests_button.inner_text().split("guests")[0])
-        current_child_count_element = new_page.locator('[data-testid="GuestPicker-book_it-form-children-stepper-a11y-value-label"]')
-        reduce_child_count_element = new_page.locator('[data-testid="GuestPicker-book_it-form-children-stepper-decrease-button"]')
-        increase_child_count_element = new_page.locator('[data-testid="GuestPicker-book_it-form-children-stepper-increase-button"]')
+        guests_button = self._loc('[id="GuestPicker-book_it-trigger"]', new_page)
+        current_guest_number = _parse_count(guests_button.inner_text())
+        current_child_count_element = self._loc('[data-testid="GuestPicker-book_it-form-children-stepper-a11y-value-label"]', new_page)
+        reduce_child_count_element = self._loc('[data-testid="GuestPicker-book_it-form-children-stepper-decrease-button"]', new_page)
+        increase_child_count_element = self._loc('[data-testid="GuestPicker-book_it-form-children-stepper-increase-button"]', new_page)
         reduce_child_count = 1
 
         try:
             logger.info("opening the guests details")
             guests_button.click()
-            current_child_num = int(current_child_count_element.inner_text().split("child")[0])
+            current_child_num = _parse_count(current_child_count_element.inner_text())
             if current_child_num > new_child_count:
                 reduce_child_count = current_child_num - new_child_count
                 for _ in range(int(reduce_child_count)):
@@ -506,25 +645,22 @@ class SearchResultsPage:
 
             else:
                 increase_child_count = new_child_count - current_child_num
-            current_child_num = int(current_child_count_element.inner_text().split("child")[0])
-            current_guest_number_after_update = int(guests_button.inner_text().split("guests")[0])
+            current_child_text, current_guest_text = self._inner_texts(
+                new_page,
+                '[data-testid="GuestPicker-book_it-form-children-stepper-a11y-value-label"]',
+                '[id="GuestPicker-book_it-trigger"]'
+            )
+            current_child_num = _parse_count(current_child_text)
+            current_guest_number_after_update = _parse_count(current_guest_text)
             assert new_child_count == current_child_num
             logger.info(f"child number updated successfully")
             logger.info(f"current guests number found: {current_child_num}")
             assert current_guest_number_after_update == current_guest_number - int(reduce_child_count)
             logger.info(f"total guest number was updated correctly: {current_guest_number_after_update}")
-            allure.attach(
-                self.page.screenshot(),
-                name="child number updated",
-                attachment_type=allure.attachment_type.PNG
-            )
+            self._attach_screenshot("child number updated")
         except AssertionError as e:
             logger.info(f"updating the child number failed: {e}")
-            allure.attach(
-                self.page.screenshot(),
-                name="failure updating child number error",
-                attachment_type=allure.attachment_type.PNG
-            )
+            self._attach_screenshot("failure updating child number error")
             raise e
 
 
@@ -544,7 +680,7 @@ class SearchResultsPage:
         new_page = page_info.value
 
         # Open the calendar
-        check_in_button_element = new_page.locator('[data-testid="change-dates-checkIn"]')
+        check_in_button_element = self._loc('[data-testid="change-dates-checkIn"]', new_page)
         check_in_button_element.click()
         # Check a date range using YYYY-MM-DD format
         is_blocked, blocked_date = self.is_date_range_blocked(
@@ -555,30 +691,29 @@ class SearchResultsPage:
 
         if is_blocked:
             logger.info(f"Cannot book this date range. Date {blocked_date} is blocked.")
-            close_cal = new_page.locator('[data-testid="availability-calendar-save"]')
+            close_cal = self._loc('[data-testid="availability-calendar-save"]', new_page)
             close_cal.click()
-            self.reserve_and_validate(popup_card_details_page, adults_count=CONST.ADULTS_COUNT)
+            self.reserve_and_validate(popup_card_details_page, adults_count=ADULTS_COUNT)
 
             return False
         else:
             logger.info("Date range is available!")
-            self.reserve_and_validate(popup_card_details_page, adults_count=CONST.ADULTS_COUNT)
+            self.reserve_and_validate(popup_card_details_page, adults_count=ADULTS_COUNT)
             return True
 
     def reserve_and_validate(self, popup_card_details_page, adults_count):
         page_info = popup_card_details_page
         new_page = page_info.value
-        reserve_button_element = new_page.locator('[data-testid="homes-pdp-cta-btn"]')
-        reserve_button_element = reserve_button_element.all()
+        reserve_button_element = self._loc('[data-testid="homes-pdp-cta-btn"]', new_page).nth(1)
         url_before_reserve = new_page.url
-        reserve_button_element[1].click()
+        reserve_button_element.click()
         logger.info(f"Reserved button was clicked")
         url_after_reserve = new_page.url
         logger.info(f"Current URL after clicking on reserve: {url_after_reserve}")
         logger.info(f"asserting the url after clicking on reserve was changed: {url_before_reserve}")
         assert url_before_reserve != url_after_reserve
         logger.info(f"asserting the number of adults {adults_count} in the url")
-        assert f"numberOfAdults={adults_count}" and "book" in url_after_reserve
+        assert f"numberOfAdults={adults_count}" in url_after_reserve and "book" in url_after_reserve
 
 
     def is_date_range_blocked(self, popup_card_details_page, start_date_str, end_date_str):
@@ -612,37 +747,25 @@ class SearchResultsPage:
         # Calculate the number of days to check
         days_to_check = (end_date - start_date).days + 1
 
-        # Iterate through each date in the range using a for loop
-        for day_offset in range(days_to_check):
-            # Get the current date
-            current_date = start_date + timedelta(days=day_offset)
-
-            # Format date to match data-testid format (MM/DD/YYYY)
-            date_str = current_date.strftime("%d/%m/%Y")
-
-            # Create locator for this date
-            date_locator = new_page.locator(f'[data-testid="calendar-day-{date_str}"]')
-
-            # Check if date exists in calendar
-            if date_locator.count() > 0:
-                # Check if date is blocked
-                blocked_attr = date_locator.first.get_attribute('data-is-day-blocked')
-                if blocked_attr == 'true':
-                    return True, date_str
-            else:
-                try:
-                # If we've checked all dates and none are blocked, click on start and end dates
-                    start_date_locator = new_page.locator(f'[data-testid="calendar-day-{start_calendar_date}"]')
-                    end_date_locator = new_page.locator(f'[data-testid="calendar-day-{end_calendar_date}"]')
-
-                    # Click on start date
-                    start_date_locator.click()
+        # Format every date in the range once to match the data-testid format (DD/MM/YYYY)
+        base = start_date.toordinal()
+        date_strs = [date.fromordinal(base + i).strftime("%d/%m/%Y") for i in range(days_to_check)]
 
-                    # Click on end date
-                    end_date_locator.click()
-                    # If we've checked all dates and none are blocked
-                except Exception as e:
-                    logger.info("added new dates")
+        # Resolve the blocked, missing and clickable calendar days in a single call
+        calendar = new_page.evaluate(
+            self._CALENDAR_RANGE_STATE_JS, [start_calendar_date, end_calendar_date, date_strs]
+        )
+        if calendar["firstBlocked"]:
+            return True, calendar["firstBlocked"]
 
+        # If part of the range is not rendered, click on start and end dates
+        if calendar["missing"]:
+            try:
+                if calendar["startOk"]:
+                    new_page.locator(f'[data-testid="calendar-day-{start_calendar_date}"]').click()
+                if calendar["endOk"]:
+                    new_page.locator(f'[data-testid="calendar-day-{end_calendar_date}"]').click()
+            except Exception as e:
+                logger.info("added new dates")
 
         return False, None
@@ -1,73 +1,272 @@
+import json
 import os
+import re
 import pytest
-from typing import Dict, Generator
-from playwright.sync_api import Browser, BrowserContext, Page, Playwright
+from types import MappingProxyType, SimpleNamespace
+from typing import Dict, Generator, Mapping
+from playwright.sync_api import Browser, BrowserContext, Page, Playwright, Error as PlaywrightError
 
+from pages.airbnb.home_page import HomePage
+from pages.airbnb.search_results_page import SearchResultsPage
+from utilities.constants import AIRBNB_STORAGE_STATE
 
-@pytest.fixture(scope="function")
-def browser_context_args(browser_context_args: Dict) -> Dict:
-    """This fixture extends the browser context arguments for Airbnb tests.
+
+@pytest.fixture(scope="session")
+def viewport() -> Mapping:
+    """This fixture computes the expected viewport size once per test session.
     
-    It sets additional options like viewport size, locale, and timezone.
+    The size is read from the VIEWPORT_WIDTH and VIEWPORT_HEIGHT environment
+    variables and defaults to 1920x1080.
+    
+    Returns:
+        Mapping: Read-only viewport size with 'width' and 'height' keys.
+    """
+    return MappingProxyType({
+        "width": int(os.environ.get("VIEWPORT_WIDTH", "1920")),
+        "height": int(os.environ.get("VIEWPORT_HEIGHT", "1080")),
+    })
+
+
+@pytest.fixture(scope="session")
+def _base_browser_context_args(_base_browser_context_args: Mapping, viewport: Mapping) -> Mapping:
+    """This fixture extends the static browser context arguments for Airbnb tests.
+    
+    It sets additional options like viewport size, locale, and timezone, and
+    applies the captured cookie consent storage state when it exists.
     
     Args:
-        browser_context_args (Dict): Base browser context arguments.
+        _base_browser_context_args (Mapping): Base static browser context arguments.
+        viewport (Mapping): The expected viewport size.
         
     Returns:
-        Dict: Updated browser context arguments.
+        Mapping: Read-only browser context arguments shared by all Airbnb tests.
     """
-    return {
-        **browser_context_args,
+    context_args = {
+        **_base_browser_context_args,
         # Set a specific viewport size for better layout rendering
-        "viewport": {"width": 1920, "height": 1080},
+        "viewport": dict(viewport),
         # Set locale and timezone for consistent date formats
         "locale": "en-US",
         "timezone_id": "Europe/Amsterdam",
-        # Record video of tests
-        "record_video_dir": "test-results/videos/airbnb",
         # Accept all cookies/permissions to avoid popups
         "permissions": ["geolocation"]
     }
 
+    # Reuse a captured cookie consent so the GDPR banner never appears
+    if AIRBNB_STORAGE_STATE.exists():
+        context_args["storage_state"] = str(AIRBNB_STORAGE_STATE)
 
-@pytest.fixture(scope="function")
-def page(browser: Browser, browser_context_args: Dict) -> Generator[Page, None, None]:
-    """This fixture creates a new browser context and page for each test.
+    return MappingProxyType(context_args)
+
+
+# Clears the page's web storage, then restores the storage state's localStorage for its origin
+_RESET_WEB_STORAGE_JS = """origins => {
+    localStorage.clear();
+    sessionStorage.clear();
+    const saved = origins.find(o => o.origin === location.origin);
+    for (const {name, value} of (saved ? saved.localStorage : [])) {
+        localStorage.setItem(name, value);
+    }
+}"""
+
+
+def _artifacts_dir(pytestconfig: pytest.Config) -> str:
+    """Directory for this xdist worker's videos and traces under the --output directory."""
+    return os.path.join(
+        pytestconfig.getoption("output"), "airbnb", os.environ.get("PYTEST_XDIST_WORKER", "gw0")
+    )
+
+
+@pytest.fixture(scope="session")
+def _shared_context_state(
+    browser: Browser, _base_browser_context_args: Mapping, pytestconfig: pytest.Config
+) -> Generator[SimpleNamespace, None, None]:
+    """This fixture creates a single browser context shared by all Airbnb tests.
+    
+    The context's cookies are snapshotted right after it is primed, before any
+    test navigates, and the localStorage origins of its storage state are kept,
+    so both can be restored between tests.
+
+    Videos are only recorded when pytest-playwright's --video option is not "off",
+    and tracing is only started when its --tracing option is not "off"; both go
+    to one directory per xdist worker under the --output directory.
     
     Args:
         browser (Browser): The browser instance.
-        browser_context_args (Dict): Browser context arguments.
+        _base_browser_context_args (Mapping): Static browser context arguments.
+        pytestconfig (pytest.Config): The pytest config, to read --video, --tracing and --output.
         
     Yields:
-        Page: The page object.
+        SimpleNamespace: The shared browser context as 'context', its initial
+            cookies as 'cookies' and its storage state origins as 'origins'.
+    """
+    context_args = dict(_base_browser_context_args)
+    if pytestconfig.getoption("video") != "off":
+        context_args["record_video_dir"] = _artifacts_dir(pytestconfig)
+
+    context = browser.new_context(**context_args)
+
+    # Set default timeout for all operations, inherited by every page
+    context.set_default_timeout(30000)
+
+    # Accept cookies up front so the consent banner never appears
+    HomePage.prime_context(context)
+    initial_cookies = context.cookies()
+
+    storage_state = context_args.get("storage_state") or {}
+    if isinstance(storage_state, (str, os.PathLike)):
+        with open(storage_state) as storage_file:
+            storage_state = json.load(storage_file)
+    initial_origins = storage_state.get("origins", [])
+
+    # Each test records its own trace chunk, see the page fixture
+    tracing = pytestconfig.getoption("tracing") != "off"
+    if tracing:
+        context.tracing.start(screenshots=True, snapshots=True, sources=True)
+    
+    yield SimpleNamespace(context=context, cookies=initial_cookies, origins=initial_origins)
+    
+    if tracing:
+        context.tracing.stop()
+    context.close()
+
+
+@pytest.fixture(scope="session")
+def shared_context(_shared_context_state: SimpleNamespace) -> BrowserContext:
+    """The browser context shared by all Airbnb tests.
+
+    Args:
+        _shared_context_state (SimpleNamespace): The shared context and its initial state.
+
+    Returns:
+        BrowserContext: The shared browser context.
     """
-    # Create a new context for each test
-    context = browser.new_context(**browser_context_args)
+    return _shared_context_state.context
+
+
+@pytest.fixture(autouse=True)
+def reset_shared_context(
+    shared_context: BrowserContext,
+    _shared_context_state: SimpleNamespace,
+    _base_browser_context_args: Mapping,
+    page: Page,
+) -> Generator[None, None, None]:
+    """This fixture restores the shared context's state after each test to keep tests isolated.
     
-    # Create a new page in the context
-    page = context.new_page()
+    Web storage of the test's page is cleared before the page closes and the
+    storage state's localStorage for that origin is put back, so a captured
+    cookie consent survives. Cookies and permissions are then reset to what the
+    context started with.
     
-    # Set default timeout for all operations
-    page.set_default_timeout(30000)
+    Args:
+        shared_context (BrowserContext): The shared browser context.
+        _shared_context_state (SimpleNamespace): The shared context's initial state.
+        _base_browser_context_args (Mapping): Static browser context arguments, for the permissions.
+        page (Page): The test's page, torn down after this fixture.
+    """
+    yield
+    try:
+        page.evaluate(_RESET_WEB_STORAGE_JS, _shared_context_state.origins)
+    except PlaywrightError:
+        # The page is already closed or on a document without web storage
+        pass
+    shared_context.clear_cookies()
+    shared_context.add_cookies(_shared_context_state.cookies)
+    shared_context.clear_permissions()
+    shared_context.grant_permissions(list(_base_browser_context_args.get("permissions", [])))
+
+
+@pytest.fixture(scope="function")
+def page(
+    shared_context: BrowserContext, pytestconfig: pytest.Config, request: pytest.FixtureRequest
+) -> Generator[Page, None, None]:
+    """This fixture opens a new page in the shared browser context for each test.
+    
+    Every page the test opens, such as listing popups, is closed after the test.
+    Each test gets its own trace chunk. With --video=retain-on-failure and
+    --tracing=retain-on-failure the videos and trace of a passing test are discarded.
+    
+    Args:
+        shared_context (BrowserContext): The shared browser context.
+        pytestconfig (pytest.Config): The pytest config, to read --video and --tracing.
+        request (pytest.FixtureRequest): Pytest request object, to read the test outcome.
+        
+    Yields:
+        Page: The page object.
+    """
+    tracing = pytestconfig.getoption("tracing")
+    if tracing != "off":
+        shared_context.tracing.start_chunk(title=request.node.nodeid)
+
+    # Record every page opened during the test, popups included
+    opened_pages = []
+
+    def track_page(opened_page: Page) -> None:
+        opened_pages.append(opened_page)
+
+    shared_context.on("page", track_page)
+
+    # Create a new page in the shared context
+    page = shared_context.new_page()
     
     # Yield the page object to the test
     yield page
     
-    # Close the context after the test
-    context.close()
+    # Close the test's pages so they do not pile up in the shared context
+    shared_context.remove_listener("page", track_page)
+    for opened_page in opened_pages:
+        opened_page.close()
+
+    # Only keep videos and traces of failed tests
+    # A test that never reached the call phase failed during setup
+    failed = request.node.rep_call.failed if hasattr(request.node, "rep_call") else True
+    if pytestconfig.getoption("video") == "retain-on-failure" and not failed:
+        for opened_page in opened_pages:
+            if opened_page.video:
+                opened_page.video.delete()
+
+    if tracing == "on" or (tracing == "retain-on-failure" and failed):
+        trace_name = re.sub(r"[^\w.-]+", "-", request.node.nodeid).strip("-")
+        shared_context.tracing.stop_chunk(
+            path=os.path.join(_artifacts_dir(pytestconfig), f"{trace_name}-trace.zip")
+        )
+    elif tracing != "off":
+        shared_context.tracing.stop_chunk()
+
+
+@pytest.fixture(scope="function")
+def pages(page: Page, viewport: Mapping) -> SimpleNamespace:
+    """This fixture binds the Airbnb page objects to the current test's page.
+    
+    Args:
+        page (Page): The page object.
+        viewport (Mapping): The expected viewport size.
+        
+    Returns:
+        SimpleNamespace: The page objects, as 'home' and 'results'.
+    """
+    expected_viewport = dict(viewport)
+    return SimpleNamespace(
+        home=HomePage(page, expected_viewport, skip_popups=AIRBNB_STORAGE_STATE.exists()),
+        results=SearchResultsPage(page, expected_viewport),
+    )
 
 
 @pytest.fixture(scope="session")
 def browser_type_launch_args(browser_type_launch_args: Dict) -> Dict:
     """Fixture to set browser launch arguments.
     
+    Set the PW_SLOW_MO environment variable (milliseconds) to add a delay
+    between actions while debugging.
+    
     Args:
         browser_type_launch_args (Dict): Original browser type launch arguments.
         
     Returns:
         Dict: Updated browser type launch arguments.
     """
-    return {
-        **browser_type_launch_args,
-        "slow_mo": 100,  # Add a small delay between actions for better stability
-    } 
\ No newline at end of file
+    args = {**browser_type_launch_args}
+    slow_mo = int(os.environ.get("PW_SLOW_MO", "0"))
+    if slow_mo:
+        args["slow_mo"] = slow_mo
+    return args 
\ No newline at end of file
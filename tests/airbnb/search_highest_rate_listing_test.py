@@ -1,17 +1,12 @@
 import allure
 import pytest
 import logging
-import os
-from datetime import datetime, timedelta
+import time
+from types import SimpleNamespace
+from typing import Mapping
 from playwright.sync_api import Page, expect, Error as PlaywrightError
 
-from pages.airbnb.home_page import HomePage
-from pages.airbnb.search_results_page import SearchResultsPage
-from utilities.constants import Constants as CONST
 
-
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger("AirbnbTest")
 
 @allure.epic("Airbnb Tests")
@@ -24,27 +19,21 @@ class TestAirbnbSearch:
     """
     
     @pytest.fixture(autouse=True)
-    def setup(self, page: Page):
+    def setup(self, page: Page, pages: SimpleNamespace, viewport: Mapping, pytestconfig: pytest.Config):
         """Setup for the test.
         
         Args:
             page: The Playwright page fixture.
+            pages: The Airbnb page objects bound to the page.
+            viewport: The expected viewport size.
+            pytestconfig: The pytest config, to read --full-page-screenshots.
         """
         self.page = page
+        self.expected_viewport = dict(viewport)
         
-        # Determine fullscreen viewport size either from environment variables or use default
-        width = int(os.environ.get("VIEWPORT_WIDTH", "1920"))
-        height = int(os.environ.get("VIEWPORT_HEIGHT", "1080"))
-        self.expected_viewport = {"width": width, "height": height}
-        
-        self.home_page = HomePage(page, self.expected_viewport)
-        self.results_page = SearchResultsPage(page, self.expected_viewport)
-        self.search_results_page = SearchResultsPage(page, self.expected_viewport)
-
+        self.home_page = pages.home
+        self.results_page = pages.results
 
-
-        # Set longer timeout for all actions
-        page.set_default_timeout(30000)
         self.home_page.search_bar.set_default_lang()
 
         
@@ -66,13 +55,19 @@ class TestAirbnbSearch:
         except PlaywrightError as e:
             logger.warning(f"[TEST TEARDOWN] Error checking viewport: {e}")
 
-            # Take a full-page screenshot of the failure, with safe error handling
+            # Take a screenshot of the failure, with safe error handling
             try:
-                screenshot = self.page.screenshot(full_page=True)
+                screenshot = self.page.screenshot(
+                    type="jpeg",
+                    quality=70,
+                    full_page=pytestconfig.getoption("full_page_screenshots"),
+                    animations="disabled",
+                    caret="hide"
+                )
                 allure.attach(
                     screenshot,
-                    name="Error Screenshot - Full Page",
-                    attachment_type=allure.attachment_type.PNG
+                    name="Error Screenshot",
+                    attachment_type=allure.attachment_type.JPG
                 )
             except PlaywrightError as pe:
                 logger.warning(f"[ERROR] Could not take screenshot: {pe}")
@@ -89,32 +84,37 @@ class TestAirbnbSearch:
                 attachment_type=allure.attachment_type.TEXT
             )
 
-    # Generate a timestamp for the allure title
-    test_timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-
     @pytest.mark.airbnb_sanity
-    @allure.title(f"Search for a stay in Amsterdam - {test_timestamp}")
-    @allure.description("This test navigates to the Airbnb homepage, searches for a stay in Amsterdam for 2 adults and 1 child, and verifies that search results are displayed.")
+    @pytest.mark.parametrize(
+        "destination,adults_count,child_count,check_in_days_from_now,check_out_days_from_now,new_child_count,new_delta_days",
+        [("Amsterdam", 2, 1, 1, 2, 0, 7)],
+        ids=["amsterdam-2-adults-1-child"],
+    )
+    @allure.title("Search for a stay")
+    @allure.description("This test navigates to the Airbnb homepage, searches for a stay in the destination for the given adults and children, and verifies that search results are displayed.")
     @allure.severity(allure.severity_level.CRITICAL)
-    def test_search_for_stay(self, setup):
-        """Test searching for a stay on Airbnb using data-testid selectors."""
-        destination = "Amsterdam"
-        check_in_days_from_now = 1
-        check_out_days_from_now = 2
-        adults_count = 2
-        child_count = 1
-        new_child_count = 0
-        new_delta_days = 7
+    def test_search_for_stay(self, setup, tmp_path, destination, adults_count, child_count, check_in_days_from_now,
+                             check_out_days_from_now, new_child_count, new_delta_days):
+        """Test searching for a stay on Airbnb using data-testid selectors.
         
-        # Log the actual test run timestamp for comparison with the title timestamp
-        run_timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        logger.info(f"[TEST INFO] Test running at {run_timestamp}, title timestamp is {self.test_timestamp}")
+        Args:
+            destination: The destination to search for.
+            adults_count: Number of adults in the search.
+            child_count: Number of children in the search.
+            check_in_days_from_now: Check-in date, in days from now.
+            check_out_days_from_now: Check-out date, in days from now.
+            new_child_count: Number of children after updating the listing.
+            new_delta_days: Days to shift the listing dates by.
+        """
+        # Stamp the allure title with the actual test run time
+        run_timestamp = time.strftime('%Y-%m-%d %H:%M:%S')
+        allure.dynamic.title(f"Search for a stay in {destination} - {run_timestamp}")
+        logger.info("[TEST INFO] Test running at %s", run_timestamp)
         
         try:
 
             search_bar = self.home_page.search_bar
             search_results = self.results_page.search_results
-            search_results_page =  self.search_results_page
 
             # Step 1: Set the destination
             search_bar.set_search_destination(destination=destination)
@@ -131,25 +131,34 @@ class TestAirbnbSearch:
             # Step 4: Click search
             search_bar.click_search_button(destination, check_in_days_from_now, check_out_days_from_now)
             
-            # Take full-page screenshot of the results
-            allure.attach(
-                self.page.screenshot(full_page=True),
-                name="Search Results - Full Page",
-                attachment_type=allure.attachment_type.PNG
+            # Take a screenshot of the results area, or of the viewport if it is not rendered
+            results_screenshot = tmp_path / "search-results.jpeg"
+            screenshot_options = {
+                "path": results_screenshot, "type": "jpeg", "quality": 70, "animations": "disabled", "caret": "hide"
+            }
+            try:
+                self.page.locator("main[id='site-content']").screenshot(timeout=3000, **screenshot_options)
+            except PlaywrightError as e:
+                logger.warning("[TEST WARNING] Results area screenshot failed, using the viewport: %s", e)
+                self.page.screenshot(**screenshot_options)
+            allure.attach.file(
+                results_screenshot,
+                name="Search Results",
+                attachment_type=allure.attachment_type.JPG
             )
             
             # Step 5: Select the highest-rated listing and validate
             logger.info("Selecting the highest-rated listing from search results")
             popup_card_details = search_results.select_highest_rated_listing()
 
-            search_results_page.validate_highest_rated_listing_details(popup_card_details, adults_count, child_count, check_in_days_from_now, check_out_days_from_now)
+            self.results_page.validate_highest_rated_listing_details(popup_card_details, adults_count, child_count, check_in_days_from_now, check_out_days_from_now)
 
             # Step 6 - update listing details guests
-            search_results_page.remove_kids_from__highest_rated_listing(popup_card_details, new_child_count)
-            # search_results_page.update_highest_rated_listing_details(popup_card_details, new_child_count, check_in_days_from_now, check_out_days_from_now, new_delta_days)
+            self.results_page.remove_kids_from__highest_rated_listing(popup_card_details, new_child_count)
+            # self.results_page.update_highest_rated_listing_details(popup_card_details, new_child_count, check_in_days_from_now, check_out_days_from_now, new_delta_days)
 
             #Step 7 - update listing details dates
-            search_results_page.update_highest_rated_listing_date(popup_card_details, check_in_days_from_now, check_out_days_from_now, new_delta_days=7)
+            self.results_page.update_highest_rated_listing_date(popup_card_details, check_in_days_from_now, check_out_days_from_now, new_delta_days=new_delta_days)
 
 
         except Exception as e:
@@ -1,16 +1,35 @@
-from typing import Dict
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Mapping
 import os
 
-import allure
 import pytest
 import requests
+from requests.adapters import HTTPAdapter
 from _pytest.fixtures import FixtureRequest, SubRequest
 from _pytest.nodes import Item
 from axe_playwright_python.sync_playwright import Axe
 from playwright.sync_api import Page, Playwright, Error as PlaywrightError
 
 from utilities.axe_helper import AxeHelper
-from utilities.constants import Constants
+from utilities.constants import AUTOMATION_USER_AGENT
+
+# Single pooled connection reused for the public IP lookup
+_HTTP_SESSION = requests.Session()
+_HTTP_SESSION.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=1))
+
+
+def pytest_addoption(parser: pytest.Parser):
+    """Register custom command line options.
+
+    Args:
+        parser (pytest.Parser): Pytest command line parser.
+    """
+    parser.addoption(
+        "--full-page-screenshots",
+        action="store_true",
+        default=False,
+        help="Capture the full scrollable page in failure screenshots.",
+    )
 
 
 @pytest.fixture(scope="function", autouse=True)
@@ -48,28 +67,29 @@ def axe_playwright():
     yield AxeHelper(Axe())
 
 
-@pytest.fixture(scope="function")
+@pytest.fixture(scope="session")
 def browser_context_args(
     browser_context_args: Dict, base_url: str, request: SubRequest
-):
+) -> Mapping:
     """This fixture allows setting browser context arguments for Playwright.
 
+    It is session-scoped, so the arguments are computed once per session; with
+    indirect parametrization pytest keeps one instance per 'storage_state' user.
+
     Args:
-        browser_context_args (dict): Base browser context arguments.
+        browser_context_args (dict): Base browser context arguments from pytest-playwright.
         request (SubRequest): Pytest request object to get the 'browser_context_args' fixture value.
         base_url (str): The base URL for the application under test.
-    Returns:
-        dict: Updated browser context arguments.
     See Also:
         https://playwright.dev/python/docs/api/class-browser#browser-new-contex
 
     Returns:
-        dict: Updated browser context arguments.
+        Mapping: Read-only browser context arguments.
     """
     context_args = {
         **browser_context_args,
         "no_viewport": True,
-        "user_agent": Constants.AUTOMATION_USER_AGENT,
+        "user_agent": AUTOMATION_USER_AGENT,
     }
 
     if hasattr(request, "param"):
@@ -82,7 +102,22 @@ def browser_context_args(
                 }
             ]
         }
-    return context_args
+    return MappingProxyType(context_args)
+
+
+@pytest.fixture(scope="session")
+def _base_browser_context_args(browser_context_args: Mapping) -> Mapping:
+    """Browser context arguments for suites that create their own shared context.
+
+    Suite conftests override this fixture to extend the arguments.
+
+    Args:
+        browser_context_args (Mapping): Browser context arguments for the session.
+
+    Returns:
+        Mapping: Read-only browser context arguments shared by all tests.
+    """
+    return browser_context_args
 
 
 @pytest.fixture(scope="session")
@@ -125,11 +160,49 @@ def pytest_runtest_makereport(item: Item, call):
     setattr(item, f"rep_{rep.when}", rep)
 
 
+@pytest.fixture(scope="session")
+def public_ip() -> str:
+    """Fixture to look up the public IP address of the machine running the tests.
+
+    The address does not change during a session, so it is fetched only once.
+
+    Returns:
+        str: The public IP address, or the reason it is unavailable.
+    """
+    try:
+        return _HTTP_SESSION.get("https://api.ipify.org", timeout=(2, 2)).text
+    except Exception as e:
+        return f"unavailable: {e}"
+
+
+def _safe_attach(producer: Callable[[], Any], name: str, atype, err_name: str) -> None:
+    """Attach the output of producer to the Allure report, or the error it raised.
+
+    Args:
+        producer (Callable[[], Any]): Callable returning the attachment body.
+        name (str): Name of the attachment.
+        atype: Allure attachment type of the body.
+        err_name (str): Name of the text attachment used when producer fails.
+    """
+    import allure
+
+    try:
+        allure.attach(body=producer(), name=name, attachment_type=atype)
+    except PlaywrightError as e:
+        allure.attach(
+            body=f"{type(e).__name__}: {e}",
+            name=err_name,
+            attachment_type=allure.attachment_type.TEXT,
+        )
+
+
 @pytest.fixture(autouse=True)
 def attach_playwright_results(page: Page, request: FixtureRequest):
     """Fixture to perform teardown actions and attach results to Allure report
     on failure.
 
+    Nothing is attached when the allure-pytest plugin is not loaded.
+
     Args:
         page (Page): Playwright page object.
         request: Pytest request object.
@@ -137,72 +210,53 @@ def attach_playwright_results(page: Page, request: FixtureRequest):
     yield
     
     # Check if test has run and has failed
-    if hasattr(request.node, "rep_call") and request.node.rep_call.failed:
-        try:
-            allure.attach(
-                body=page.url,
-                name="URL",
-                attachment_type=allure.attachment_type.URI_LIST,
-            )
-        except PlaywrightError as e:
-            allure.attach(
-                body=f"Could not get URL: {e}",
-                name="URL Error",
-                attachment_type=allure.attachment_type.TEXT,
-            )
-            
-        try:
-            screenshot = page.screenshot(full_page=True)
-            allure.attach(
-                screenshot,
-                name="Screen shot on failure",
-                attachment_type=allure.attachment_type.PNG,
-            )
-        except PlaywrightError as e:
-            allure.attach(
-                body=f"Could not take screenshot: {e}",
-                name="Screenshot Error",
-                attachment_type=allure.attachment_type.TEXT,
-            )
-            
-        try:
-            allure.attach(
-                body=get_public_ip(),
-                name="public ip address",
-                attachment_type=allure.attachment_type.TEXT,
-            )
-        except Exception as e:
-            allure.attach(
-                body=f"Could not get public IP: {e}",
-                name="IP Error",
-                attachment_type=allure.attachment_type.TEXT,
-            )
-
-@pytest.fixture(scope="function")
-def context(browser):
-    """Configure Playwright context to save videos only for failed tests"""
-    context = browser.new_context(record_video_dir="videos/")  # Save videos in the 'videos' folder
-    yield context
-    context.close()
-
-@pytest.fixture(scope="function")
-def page(context):
-    """Create a new page instance"""
-    page = context.new_page()
-    yield page
-    page.close()
-
-@pytest.hookimpl(tryfirst=True, hookwrapper=True)
-def pytest_runtest_makereport(item):
-    """Attach video to Allure report if the test fails"""
-    outcome = yield
-    report = outcome.get_result()
-
-    # If the test failed, attach the video
-    if report.failed:
-        page = item.funcargs.get("page")
-        if page and page.video:
-            video_path = page.video.path()
-            if video_path and os.path.exists(video_path):
-                with open(video_path, "rb") as video_file:
-                    allure.attach(video_file.read(), name="Test Failure Video", attachment_type=allure.attachment_type.WEBM)
+    if (
+        hasattr(request.node, "rep_call")
+        and request.node.rep_call.failed
+        and request.config.pluginmanager.has_plugin("allure_pytest")
+    ):
+        # Imported here so runs without Allure never pay for it
+        import allure
+
+        _safe_attach(
+            lambda: page.url, "URL", allure.attachment_type.URI_LIST, "URL Error"
+        )
+        _safe_attach(
+            lambda: page.screenshot(
+                type="jpeg",
+                quality=70,
+                full_page=request.config.getoption("full_page_screenshots"),
+                animations="disabled",
+                caret="hide",
+            ),
+            "Screen shot on failure",
+            allure.attachment_type.JPG,
+            "Screenshot Error",
+        )
+
+        allure.attach(
+            # Resolved lazily so passing sessions never hit the network
+            body=request.getfixturevalue("public_ip"),
+            name="public ip address",
+            attachment_type=allure.attachment_type.TEXT,
+        )
+
+        # Videos are only written out once the page is closed
+        if page.video:
+            try:
+                page.close()
+                video_path = page.video.path()
+                if os.path.exists(video_path):
+                    # Attach by path so the video is never loaded into memory
+                    allure.attach.file(
+                        video_path,
+                        name="Test Failure Video",
+                        attachment_type=allure.attachment_type.WEBM,
+                        extension="webm",
+                    )
+            except PlaywrightError as e:
+                allure.attach(
+                    body=f"Could not attach video: {e}",
+                    name="Video Error",
+                    attachment_type=allure.attachment_type.TEXT,
+                )
@@ -1,13 +1,15 @@
 from pathlib import Path
+from typing import Final
 
+_ROOT_PATH: Final[Path] = Path(__file__).resolve().parent.parent
 
-class Constants:
-    AUTOMATION_USER_AGENT: str = "automation"
-    DATA_PATH: Path = Path(Path(__file__).absolute().parent.parent, "data")
-    CHROME_DOWNLOAD_DIRECTORY: Path = DATA_PATH / "downloads"
-    DIFF_TOLERANCE_PERCENT: float = 0.01
-    BASE_URL: str = "https://www.airbnb.com/"
+AUTOMATION_USER_AGENT: Final[str] = "automation"
+DATA_PATH: Final[Path] = _ROOT_PATH / "data"
+AIRBNB_STORAGE_STATE: Final[Path] = _ROOT_PATH / "artifacts" / "airbnb_storage.json"
+CHROME_DOWNLOAD_DIRECTORY: Final[Path] = DATA_PATH / "downloads"
+DIFF_TOLERANCE_PERCENT: Final[float] = 0.01
+BASE_URL: Final[str] = "https://www.airbnb.com/"
 
-    #test helpers
-    ADULTS_COUNT = 2
-    TOTAL_GUESTS_COUNT = 2
+#test helpers
+ADULTS_COUNT: Final[int] = 2
+TOTAL_GUESTS_COUNT: Final[int] = 2